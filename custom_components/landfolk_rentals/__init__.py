@@ -3,31 +3,77 @@ from __future__ import annotations
 
 import logging
 from datetime import timedelta
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-import aiohttp
-from icalendar import Calendar
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_CALENDAR_URL, UPDATE_INTERVAL
+from .archive import BookingArchive, async_import_statistics
+from .const import (
+    DOMAIN,
+    CONF_ARCHIVE_RETENTION,
+    CONF_CALENDAR_URL,
+    CONF_CHECKIN_TIME,
+    CONF_CHECKOUT_TIME,
+    CONF_EXCLUDE_BLOCKED,
+    CONF_MAX_FEED_SIZE,
+    DEFAULT_ARCHIVE_RETENTION,
+    DEFAULT_CHECKIN_TIME,
+    DEFAULT_CHECKOUT_TIME,
+    DEFAULT_EXCLUDE_BLOCKED,
+    DEFAULT_MAX_FEED_SIZE,
+    UPDATE_INTERVAL,
+)
+from .bookings import BookingIndex, make_booking
+from .feed import FeedDownload, FeedError, InvalidFeed, async_download_feed, parse_feed
+from .localtime import LocalTimeNormalizer
+from .services import async_setup_services
+from .triggers import DATA_SCHEDULERS, async_get_scheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = ["calendar", "sensor", "binary_sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Landfolk Rentals Calendar services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Landfolk Rentals Calendar from a config entry."""
+    setup_started = time.perf_counter()
     
     coordinator = LandfolkDataUpdateCoordinator(hass, entry)
+    await coordinator.archive.async_load()
     await coordinator.async_config_entry_first_refresh()
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
+    # Exact check-in/out callbacks for device triggers and bus events
+    scheduler = async_get_scheduler(hass, entry.entry_id)
+    entry.async_on_unload(scheduler.async_attach_coordinator(coordinator))
+    entry.async_on_unload(scheduler.async_setup_events())
+    
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
+    coordinator.setup_duration = time.perf_counter() - setup_started
+    _LOGGER.debug(
+        "Setup of %s took %.3f seconds (feed refresh %.3f seconds)",
+        entry.title,
+        coordinator.setup_duration,
+        coordinator.last_refresh_duration,
+    )
+    
     return True
 
 
@@ -39,12 +85,45 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the booking archive and scheduler when a config entry is deleted."""
+    hass.data.get(DATA_SCHEDULERS, {}).pop(entry.entry_id, None)
+    await BookingArchive(hass, entry.entry_id).async_remove()
+
+
 class LandfolkDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Landfolk calendar data."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize."""
         self.calendar_url = entry.data[CONF_CALENDAR_URL]
+        self.max_feed_bytes = (
+            entry.data.get(CONF_MAX_FEED_SIZE, DEFAULT_MAX_FEED_SIZE) * 1024
+        )
+        self.last_download: FeedDownload | None = None
+        self.total_download_bytes = 0
+        self.total_content_bytes = 0
+        self.exclude_blocked = entry.data.get(
+            CONF_EXCLUDE_BLOCKED, DEFAULT_EXCLUDE_BLOCKED
+        )
+        self.bookings: BookingIndex | None = None
+        self.archive = BookingArchive(hass, entry.entry_id)
+        self.archive_retention = entry.data.get(
+            CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION
+        )
+        self._title = entry.title
+        self.setup_duration: float | None = None
+        self.last_refresh_duration: float | None = None
+        try:
+            self.local_times = LocalTimeNormalizer(
+                entry.data.get(CONF_CHECKIN_TIME, DEFAULT_CHECKIN_TIME),
+                entry.data.get(CONF_CHECKOUT_TIME, DEFAULT_CHECKOUT_TIME),
+            )
+        except ValueError as err:
+            # Entries saved before the flows validated times can hold bad values
+            raise ConfigEntryError(
+                f"{err}; fix the check-in/out time in the integration options"
+            ) from err
         
         super().__init__(
             hass,
@@ -53,19 +132,53 @@ class LandfolkDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(minutes=UPDATE_INTERVAL),
         )
 
-    async def _async_update_data(self) -> Calendar:
+    async def _async_update_data(self) -> BookingIndex:
         """Fetch data from iCal feed."""
+        refresh_started = time.perf_counter()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.calendar_url, timeout=30) as response:
-                    if response.status != 200:
-                        raise UpdateFailed(f"Error fetching calendar: {response.status}")
+            download = await async_download_feed(
+                self.calendar_url, self.max_feed_bytes, timeout=30
+            )
+            
+            self.last_download = download
+            self.total_download_bytes += download.download_bytes
+            self.total_content_bytes += download.content_bytes
+            
+            # icalendar parsing is CPU bound, keep it off the event loop
+            raw_events = await self.hass.async_add_executor_job(
+                parse_feed, download.text
+            )
                     
-                    ical_data = await response.text()
-                    calendar = Calendar.from_ical(ical_data)
-                    return calendar
-                    
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        except (FeedError, InvalidFeed) as err:
+            raise UpdateFailed(str(err)) from err
         except Exception as err:
             raise UpdateFailed(f"Unexpected error: {err}") from err
+        
+        self.bookings = BookingIndex(
+            booking
+            for raw in raw_events
+            if (booking := make_booking(raw, self.local_times))
+        )
+        await self._async_update_archive()
+        self.last_refresh_duration = time.perf_counter() - refresh_started
+        return self.bookings
+
+    async def _async_update_archive(self) -> None:
+        """Archive bookings that have checked out and apply the retention policy."""
+        now = dt_util.utcnow().timestamp()
+        watermark = self.archive.watermark
+        try:
+            added = await self.archive.async_archive(self.bookings.bookings, now)
+            if self.archive_retention:
+                cutoff = now - self.archive_retention * 365.25 * 86400
+                await self.archive.async_apply_retention(cutoff)
+        except OSError as err:
+            _LOGGER.error("Error writing booking archive: %s", err)
+            return
+        except Exception:  # pylint: disable=broad-except
+            # The archive is a side record; never fail the feed refresh for it
+            _LOGGER.exception("Unexpected error updating booking archive")
+            return
+        
+        if added:
+            async_import_statistics(self.hass, self.archive, self._title, watermark)
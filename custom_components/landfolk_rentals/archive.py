@@ -0,0 +1,376 @@
+"""Append-only archive of past Landfolk bookings."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import logging
+import os
+import sys
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
+
+from .bookings import Booking
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Each record is four little-endian int64 values with no header, so the
+# records file can be memory-mapped and cast to "q" directly.
+RECORD_FIELDS = 4
+FIELD_START, FIELD_END, FIELD_ID, FIELD_FLAGS = range(RECORD_FIELDS)
+FLAG_BLOCKED = 1
+
+_SWAP_BYTES = sys.byteorder != "little"
+
+
+@dataclass(frozen=True)
+class ArchivedBooking:
+    """A booking read back from the archive."""
+
+    uid: str
+    start_ts: int
+    end_ts: int
+    blocked: bool
+
+    @property
+    def nights(self) -> int:
+        """Return the number of nights in Home Assistant's timezone."""
+        start = dt_util.as_local(dt_util.utc_from_timestamp(self.start_ts))
+        end = dt_util.as_local(dt_util.utc_from_timestamp(self.end_ts))
+        return (end.date() - start.date()).days
+
+
+def _read_records(path: str) -> array:
+    """Read the records file into an int64 array."""
+    records = array("q")
+    if not os.path.exists(path):
+        return records
+    with open(path, "rb+") as file:
+        data = file.read()
+        record_size = records.itemsize * RECORD_FIELDS
+        if partial := len(data) % record_size:
+            # Drop a partially written trailing record so appends stay aligned
+            _LOGGER.warning("Truncating partial record at the end of %s", path)
+            data = data[:-partial]
+            file.truncate(len(data))
+    records.frombytes(data)
+    if _SWAP_BYTES:
+        records.byteswap()
+    return records
+
+
+def _read_ids(path: str) -> list[str]:
+    """Read the interned booking IDs, one per line."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb+") as file:
+        data = file.read()
+        if (complete := data.rfind(b"\n") + 1) != len(data):
+            # Drop a partially written trailing ID; no record references it yet
+            _LOGGER.warning("Truncating partial ID at the end of %s", path)
+            data = data[:complete]
+            file.truncate(complete)
+    # Only "\n" separates IDs; splitlines() would also split on characters
+    # such as U+2028 that can appear inside a UID
+    return data.decode("utf-8").split("\n")[:-1]
+
+
+def _read_meta(path: str) -> dict:
+    """Read the retention metadata."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    """Replace the retention metadata atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    os.replace(f"{path}.tmp", path)
+
+
+def _to_bytes(records: array) -> bytes:
+    """Serialize records in the on-disk byte order."""
+    if _SWAP_BYTES:
+        records = array("q", records)
+        records.byteswap()
+    return records.tobytes()
+
+
+def _append_files(
+    records_path: str, ids_path: str, records: bytes, ids: list[str]
+) -> None:
+    """Append new IDs and records; IDs first so records never reference a missing ID."""
+    os.makedirs(os.path.dirname(records_path), exist_ok=True)
+    if ids:
+        with open(ids_path, "a", encoding="utf-8") as file:
+            file.write("".join(f"{uid}\n" for uid in ids))
+    with open(records_path, "ab") as file:
+        file.write(records)
+
+
+def _replace_files(
+    records_path: str, ids_path: str, records: bytes, ids: list[str]
+) -> None:
+    """Rewrite both files after compaction, replacing each one atomically."""
+    with open(f"{ids_path}.tmp", "w", encoding="utf-8") as file:
+        file.write("".join(f"{uid}\n" for uid in ids))
+    with open(f"{records_path}.tmp", "wb") as file:
+        file.write(records)
+    os.replace(f"{ids_path}.tmp", ids_path)
+    os.replace(f"{records_path}.tmp", records_path)
+
+
+class BookingArchive:
+    """Fixed-width, append-only history of bookings that have checked out.
+
+    Records are kept sorted by check-out, which is the order bookings leave
+    the feed, so range scans are a bisect over the check-out column.
+    Booking UIDs are interned in a side file and referenced by index.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the archive."""
+        self.hass = hass
+        self.entry_id = entry_id
+        prefix = hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}")
+        self.records_path = f"{prefix}.archive"
+        self.ids_path = f"{prefix}.archive_ids"
+        self.meta_path = f"{prefix}.archive_meta"
+        # Nights dropped by retention, so long-term statistic sums stay monotonic
+        self.retired_nights = 0
+        # Latest check-out already included in retired_nights
+        self.retired_through = 0
+        self._records = array("q")
+        self._ends = array("q")
+        self._ids: list[str] = []
+        self._id_lookup: dict[str, int] = {}
+        # How often each (ID index, start, end) is archived; UIDs can be
+        # missing or shared, so the UID alone does not identify a booking
+        self._archived: Counter[tuple[int, int, int]] = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of archived bookings."""
+        return len(self._ends)
+
+    @property
+    def watermark(self) -> int:
+        """Return the latest archived check-out timestamp."""
+        return self._ends[-1] if self._ends else 0
+
+    async def async_load(self) -> None:
+        """Load the archive from disk."""
+        self._records = await self.hass.async_add_executor_job(
+            _read_records, self.records_path
+        )
+        self._ids = await self.hass.async_add_executor_job(_read_ids, self.ids_path)
+        meta = await self.hass.async_add_executor_job(_read_meta, self.meta_path)
+        self.retired_nights = meta.get("retired_nights", 0)
+        self.retired_through = meta.get("retired_through", 0)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the in-memory lookups from the records and IDs."""
+        self._ends = self._records[FIELD_END::RECORD_FIELDS]
+        self._id_lookup = {uid: index for index, uid in enumerate(self._ids)}
+        self._archived = Counter(
+            zip(
+                self._records[FIELD_ID::RECORD_FIELDS],
+                self._records[FIELD_START::RECORD_FIELDS],
+                self._ends,
+            )
+        )
+
+    def _intern(self, uid: str, new_ids: list[str]) -> int:
+        """Return the index of a booking ID, adding it if needed."""
+        if (index := self._id_lookup.get(uid)) is None:
+            index = self._id_lookup[uid] = len(self._ids)
+            self._ids.append(uid)
+            new_ids.append(uid)
+        return index
+
+    async def async_archive(self, bookings: Iterable[Booking], now: float) -> int:
+        """Append bookings that have checked out; return how many were added."""
+        watermark = self.watermark
+        candidates = sorted(
+            (booking for booking in bookings if booking.end_ts <= now),
+            key=lambda booking: booking.end_ts,
+        )
+
+        new_ids: list[str] = []
+        new_records = array("q")
+        seen: Counter[tuple[str, int, int]] = Counter()
+        for booking in candidates:
+            # The IDs file is newline separated
+            uid = booking.uid.replace("\n", " ")
+            start, end = int(booking.start_ts), int(booking.end_ts)
+            key = (uid, start, end)
+            seen[key] += 1
+            index = self._id_lookup.get(uid)
+            # Identical bookings are told apart by how many of them the feed has
+            if index is not None and seen[key] <= self._archived[(index, start, end)]:
+                continue
+            if end < watermark:
+                # Appending would break the check-out ordering range scans rely on
+                _LOGGER.debug(
+                    "Not archiving %s, it checked out before the archive watermark",
+                    uid,
+                )
+                continue
+            index = self._intern(uid, new_ids)
+            new_records.extend(
+                (start, end, index, FLAG_BLOCKED if booking.blocked else 0)
+            )
+            self._archived[(index, start, end)] += 1
+
+        if not new_records:
+            return 0
+
+        try:
+            await self.hass.async_add_executor_job(
+                _append_files,
+                self.records_path,
+                self.ids_path,
+                _to_bytes(new_records),
+                new_ids,
+            )
+        except OSError:
+            # Resync the interned IDs with what actually reached the disk
+            await self.async_load()
+            raise
+        self._records.extend(new_records)
+        self._ends.extend(new_records[FIELD_END::RECORD_FIELDS])
+        return len(new_records) // RECORD_FIELDS
+
+    def _record(self, position: int) -> ArchivedBooking:
+        """Return the archived booking at a record position."""
+        offset = position * RECORD_FIELDS
+        start, end, index, flags = self._records[offset : offset + RECORD_FIELDS]
+        return ArchivedBooking(
+            uid=self._ids[index],
+            start_ts=start,
+            end_ts=end,
+            blocked=bool(flags & FLAG_BLOCKED),
+        )
+
+    def scan(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[ArchivedBooking]:
+        """Yield archived bookings that checked out in [start, end), oldest first."""
+        low = 0 if start is None else bisect_left(self._ends, start)
+        high = len(self._ends) if end is None else bisect_left(self._ends, end)
+        for position in range(low, high):
+            yield self._record(position)
+
+    async def async_apply_retention(self, cutoff: float) -> int:
+        """Drop bookings that checked out before cutoff; return how many were dropped."""
+        dropped = bisect_left(self._ends, cutoff)
+        if not dropped:
+            return 0
+
+        # Records up to retired_through may still be on disk if a previous
+        # compaction saved its metadata but failed to swap the files.
+        retired_nights = self.retired_nights + sum(
+            booking.nights
+            for booking in self.scan(end=cutoff)
+            if not booking.blocked and booking.end_ts > self.retired_through
+        )
+        retired_through = self._ends[dropped - 1]
+
+        # Compact the interned IDs to the ones still referenced
+        kept = self._records[dropped * RECORD_FIELDS :]
+        remap: dict[int, int] = {}
+        ids: list[str] = []
+        for offset in range(FIELD_ID, len(kept), RECORD_FIELDS):
+            old_index = kept[offset]
+            if (new_index := remap.get(old_index)) is None:
+                new_index = remap[old_index] = len(ids)
+                ids.append(self._ids[old_index])
+            kept[offset] = new_index
+
+        # Write the metadata first, raising before the swap if it fails; if
+        # the swap fails the dropped records are recognised by retired_through
+        # and not counted again.
+        await self.hass.async_add_executor_job(
+            _write_meta,
+            self.meta_path,
+            {"retired_nights": retired_nights, "retired_through": retired_through},
+        )
+        await self.hass.async_add_executor_job(
+            _replace_files, self.records_path, self.ids_path, _to_bytes(kept), ids
+        )
+        self.retired_nights = retired_nights
+        self.retired_through = retired_through
+        self._records = kept
+        self._ids = ids
+        self._reindex()
+        return dropped
+
+    async def async_remove(self) -> None:
+        """Delete the archive files."""
+
+        def _remove() -> None:
+            for path in (self.records_path, self.ids_path, self.meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        await self.hass.async_add_executor_job(_remove)
+
+    def statistics_rows(self, since: float = 0) -> list[dict]:
+        """Return hourly cumulative booked-night rows for check-outs at or after since.
+
+        Blocked periods are not counted.
+        """
+        total = self.retired_nights
+        rows: dict[int, dict] = {}
+        for booking in self.scan():
+            if booking.blocked or booking.end_ts <= self.retired_through:
+                continue
+            total += booking.nights
+            if booking.end_ts < since:
+                continue
+            hour = booking.end_ts - booking.end_ts % 3600
+            row = rows.setdefault(hour, {"state": 0})
+            row["state"] += booking.nights
+            row["sum"] = total
+        return [
+            {"start": datetime.fromtimestamp(hour, dt_util.UTC), **row}
+            for hour, row in rows.items()
+        ]
+
+
+def async_import_statistics(
+    hass: HomeAssistant, archive: BookingArchive, title: str, since: float
+) -> None:
+    """Feed archived booked nights into long-term statistics."""
+    if "recorder" not in hass.config.components:
+        return
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.models import StatisticMetaData
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.statistics import (
+        async_add_external_statistics,
+    )
+
+    if not (rows := archive.statistics_rows(since)):
+        return
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"{title} booked nights",
+        source=DOMAIN,
+        statistic_id=f"{DOMAIN}:booked_nights_{archive.entry_id.lower()}",
+        unit_of_measurement="nights",
+    )
+    async_add_external_statistics(hass, metadata, rows)
@@ -1,7 +1,6 @@
 """Binary sensor platform for Landfolk Rentals."""
 from __future__ import annotations
 
-from datetime import datetime
 import logging
 
 from homeassistant.components.binary_sensor import (
@@ -9,16 +8,16 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
+from .bookings import Booking
 from .const import (
     DOMAIN,
-    CONF_CHECKIN_TIME,
-    CONF_CHECKOUT_TIME,
-    DEFAULT_CHECKIN_TIME,
-    DEFAULT_CHECKOUT_TIME,
+    CONF_EXCLUDE_BLOCKED,
+    DEFAULT_EXCLUDE_BLOCKED,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,12 +34,12 @@ async def async_setup_entry(
     async_add_entities([LandfolkActiveRentalSensor(coordinator, config_entry)], True)
 
 
-class LandfolkActiveRentalSensor(BinarySensorEntity):
+class LandfolkActiveRentalSensor(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor that indicates if there's an active rental right now."""
 
     def __init__(self, coordinator, config_entry: ConfigEntry) -> None:
         """Initialize the binary sensor."""
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._attr_name = "Landfolk Active Rental"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_active"
@@ -53,19 +52,12 @@ class LandfolkActiveRentalSensor(BinarySensorEntity):
             "entry_type": "service",
         }
         
-        # Get configurable check-in/out times and exclude blocked option
-        from .const import CONF_EXCLUDE_BLOCKED, DEFAULT_EXCLUDE_BLOCKED
-        self._checkin_time = config_entry.data.get(
-            CONF_CHECKIN_TIME, DEFAULT_CHECKIN_TIME
-        )
-        self._checkout_time = config_entry.data.get(
-            CONF_CHECKOUT_TIME, DEFAULT_CHECKOUT_TIME
-        )
+        # Get configurable exclude blocked option
         self._exclude_blocked = config_entry.data.get(
             CONF_EXCLUDE_BLOCKED, DEFAULT_EXCLUDE_BLOCKED
         )
         
-        self._current_event = None
+        self._current_event: Booking | None = None
 
     @property
     def icon(self) -> str:
@@ -82,102 +74,50 @@ class LandfolkActiveRentalSensor(BinarySensorEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional attributes."""
-        if self._current_event:
+        if booking := self._current_event:
             now = dt_util.now()
             
-            # Extract booking ID from summary
-            import re
-            booking_id = None
-            if match := re.search(r'#([a-zA-Z0-9]+)', self._current_event["summary"]):
-                booking_id = match.group(1)
-            
             # Calculate time until checkout
-            seconds_until_checkout = (self._current_event["end"] - now).total_seconds()
+            seconds_until_checkout = (booking.end - now).total_seconds()
             days_until_checkout = int(seconds_until_checkout / 86400)
             hours_until_checkout = int((seconds_until_checkout % 86400) / 3600)
             
             return {
-                "summary": self._current_event["summary"],
-                "booking_id": booking_id,
-                "check_in": self._current_event["start"].isoformat(),
-                "check_out": self._current_event["end"].isoformat(),
-                "nights": (self._current_event["end"].date() - self._current_event["start"].date()).days,
+                "summary": booking.summary,
+                "booking_id": booking.booking_id,
+                "check_in": booking.start.isoformat(),
+                "check_out": booking.end.isoformat(),
+                "nights": booking.nights,
                 "days_until_checkout": days_until_checkout,
                 "hours_until_checkout": hours_until_checkout,
                 "seconds_until_checkout": int(seconds_until_checkout),
             }
         return {}
 
+    @property
+    def should_poll(self) -> bool:
+        """Keep polling so occupancy follows check-in/out between feed refreshes."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the state from a refreshed booking index."""
+        self._async_update_from_bookings()
+        super()._handle_coordinator_update()
+
     async def async_update(self) -> None:
         """Update the binary sensor."""
-        await self.coordinator.async_request_refresh()
-        
-        calendar = self.coordinator.data
-        if not calendar:
+        self._async_update_from_bookings()
+
+    @callback
+    def _async_update_from_bookings(self) -> None:
+        """Compute the state from the coordinator's booking index."""
+        bookings = self.coordinator.data
+        if not bookings:
             self._current_event = None
             return
         
-        now = dt_util.now()
-        
-        # Check if we're currently within any event
-        for component in calendar.walk():
-            if component.name == "VEVENT":
-                event = self._parse_event(component)
-                if event and event["start"] <= now < event["end"]:
-                    # Filter blocked events if configured
-                    if self._exclude_blocked and "blocked" in event["summary"].lower():
-                        continue
-                    self._current_event = event
-                    return
-        
-        # No active rental found
-        self._current_event = None
-
-    def _parse_event(self, component) -> dict | None:
-        """Parse an iCal event component into a dict."""
-        try:
-            from datetime import datetime, timedelta
-            
-            summary = str(component.get("summary", "Booking"))
-            uid = str(component.get("uid", ""))
-            
-            # Get start and end datetime
-            dtstart = component.get("dtstart").dt
-            dtend = component.get("dtend").dt
-            
-            # Parse the configured check-in/out times
-            checkin_hour, checkin_minute = map(int, self._checkin_time.split(":"))
-            checkout_hour, checkout_minute = map(int, self._checkout_time.split(":"))
-            
-            # Landfolk uses VALUE=DATE format, so dtstart/dtend are date objects, not datetime
-            if isinstance(dtstart, datetime):
-                start = dtstart
-            else:
-                # Date only - apply check-in time
-                start = datetime.combine(dtstart, datetime.min.time())
-                start = start.replace(hour=checkin_hour, minute=checkin_minute)
-            
-            if isinstance(dtend, datetime):
-                end = dtend
-            else:
-                # Date only - apply check-out time
-                # Landfolk's DTEND represents the actual checkout date (not exclusive)
-                end = datetime.combine(dtend, datetime.min.time())
-                end = end.replace(hour=checkout_hour, minute=checkout_minute)
-            
-            # Make timezone-aware using Home Assistant's timezone
-            if start.tzinfo is None:
-                start = dt_util.as_local(start)
-            if end.tzinfo is None:
-                end = dt_util.as_local(end)
-            
-            return {
-                "summary": summary,
-                "uid": uid,
-                "start": start,
-                "end": end,
-            }
-            
-        except Exception as err:
-            _LOGGER.error("Error parsing event: %s", err)
-            return None
+        # Check if we're currently within any booking
+        self._current_event = bookings.active_at(
+            dt_util.now().timestamp(), self._exclude_blocked
+        )
@@ -0,0 +1,222 @@
+"""In-memory booking index for Landfolk Rentals."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+import re
+
+from .feed import RawEvent
+from .localtime import LocalTimeNormalizer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Booking IDs appear in the summary, e.g. "Booking #b75001f9"
+BOOKING_ID_PATTERN = re.compile(r"#([a-zA-Z0-9]+)")
+
+EDGE_START = "start"
+EDGE_END = "end"
+
+# (start_ts, uid, end_ts, summary, ordinal among otherwise equal bookings)
+CursorKey = tuple[float, str, float, str, int]
+
+BOOKING_FIELDS = (
+    "uid",
+    "summary",
+    "booking_id",
+    "start",
+    "end",
+    "nights",
+    "blocked",
+)
+
+
+@dataclass(frozen=True)
+class Booking:
+    """A single booking from the Landfolk feed."""
+
+    uid: str
+    summary: str
+    start: datetime
+    end: datetime
+    start_ts: float = field(compare=False)
+    end_ts: float = field(compare=False)
+
+    @property
+    def sort_key(self) -> tuple[float, str, float, str]:
+        """Return the ordering of this booking in the index."""
+        return (self.start_ts, self.uid, self.end_ts, self.summary)
+
+    @property
+    def booking_id(self) -> str | None:
+        """Return the booking ID parsed from the summary."""
+        if match := BOOKING_ID_PATTERN.search(self.summary):
+            return match.group(1)
+        return None
+
+    @property
+    def blocked(self) -> bool:
+        """Return true if this is a 'Blocked' period rather than a booking."""
+        return "blocked" in self.summary.lower()
+
+    @property
+    def nights(self) -> int:
+        """Return the number of nights (date difference, not time difference)."""
+        return (self.end.date() - self.start.date()).days
+
+    def as_dict(self, fields: Iterable[str] = BOOKING_FIELDS) -> dict:
+        """Return a JSON-friendly representation, limited to the given fields."""
+        result = {}
+        for name in fields:
+            value = getattr(self, name)
+            result[name] = value.isoformat() if isinstance(value, datetime) else value
+        return result
+
+
+def make_booking(raw: RawEvent, local_times: LocalTimeNormalizer) -> Booking | None:
+    """Build a Booking from a raw feed event."""
+    uid, summary, dtstart, dtend = raw
+    try:
+        start, start_ts = local_times.check_in(dtstart)
+        end, end_ts = local_times.check_out(dtend)
+    except Exception as err:
+        _LOGGER.error("Error parsing event: %s", err)
+        return None
+    return Booking(
+        uid=uid,
+        summary=summary,
+        start=start,
+        end=end,
+        start_ts=start_ts,
+        end_ts=end_ts,
+    )
+
+
+class BookingIndex:
+    """Bookings sorted by check-in and by check-out for fast lookups."""
+
+    def __init__(self, bookings: Iterable[Booking] = ()) -> None:
+        """Initialize the index."""
+        self.bookings: list[Booking] = sorted(bookings, key=lambda b: b.sort_key)
+        self._by_end: list[Booking] = sorted(self.bookings, key=lambda b: b.end_ts)
+        # UIDs can be missing, so the sort key alone may repeat; a trailing
+        # ordinal among equal keys makes every cursor position unique.
+        self._keys: list[CursorKey] = []
+        for booking in self.bookings:
+            key = booking.sort_key
+            duplicate = (
+                self._keys[-1][-1] + 1
+                if self._keys and self._keys[-1][:-1] == key
+                else 0
+            )
+            self._keys.append((*key, duplicate))
+        self._starts = [booking.start_ts for booking in self.bookings]
+        self._ends = [booking.end_ts for booking in self._by_end]
+        self._max_duration = max(
+            (booking.end_ts - booking.start_ts for booking in self.bookings),
+            default=0.0,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of bookings."""
+        return len(self.bookings)
+
+    def _edge_order(self, edge: str) -> tuple[list[Booking], list[float]]:
+        """Return the bookings and timestamps sorted by check-in or check-out."""
+        if edge == EDGE_START:
+            return self.bookings, self._starts
+        return self._by_end, self._ends
+
+    def next_edge(
+        self, edge: str, after: float, exclude_blocked: bool = False
+    ) -> Booking | None:
+        """Return the first booking whose check-in/out is strictly after a timestamp."""
+        ordered, keys = self._edge_order(edge)
+        for position in range(bisect_right(keys, after), len(ordered)):
+            booking = ordered[position]
+            if exclude_blocked and booking.blocked:
+                continue
+            return booking
+        return None
+
+    def at_edge(
+        self, edge: str, when: float, exclude_blocked: bool = False
+    ) -> list[Booking]:
+        """Return every booking checking in/out exactly at a timestamp."""
+        ordered, keys = self._edge_order(edge)
+        return [
+            booking
+            for booking in ordered[bisect_left(keys, when) : bisect_right(keys, when)]
+            if not (exclude_blocked and booking.blocked)
+        ]
+
+    def starting_from(
+        self, when: float, exclude_blocked: bool = False
+    ) -> list[Booking]:
+        """Return bookings checking in at or after a timestamp, by check-in."""
+        return [
+            booking
+            for booking in self.bookings[bisect_left(self._starts, when):]
+            if not (exclude_blocked and booking.blocked)
+        ]
+
+    def active_at(self, when: float, exclude_blocked: bool = False) -> Booking | None:
+        """Return the first booking checked in at a timestamp, if any."""
+        low = bisect_left(self._starts, when - self._max_duration)
+        for position in range(low, bisect_right(self._starts, when)):
+            booking = self.bookings[position]
+            if booking.end_ts <= when:
+                continue
+            if exclude_blocked and booking.blocked:
+                continue
+            return booking
+        return None
+
+    def query(
+        self,
+        *,
+        start: float | None = None,
+        end: float | None = None,
+        exclude_blocked: bool = False,
+        min_nights: int = 0,
+        descending: bool = False,
+        after: CursorKey | None = None,
+        limit: int = 50,
+    ) -> tuple[list[Booking], CursorKey | None]:
+        """Return a page of bookings overlapping [start, end) and the key to resume from.
+
+        ``after`` is the cursor key of the last booking of the previous page.
+        The returned key is None when there are no further matches.
+        """
+        low = 0
+        high = len(self.bookings)
+        if start is not None:
+            # No booking is longer than the longest one, so anything starting
+            # earlier than that cannot overlap the range.
+            low = bisect_left(self._starts, start - self._max_duration)
+        if end is not None:
+            high = bisect_left(self._starts, end)
+        if after is not None:
+            if descending:
+                high = min(high, bisect_left(self._keys, after))
+            else:
+                low = max(low, bisect_right(self._keys, after))
+
+        positions = range(high - 1, low - 1, -1) if descending else range(low, high)
+        page: list[Booking] = []
+        last_key: CursorKey | None = None
+        for position in positions:
+            booking = self.bookings[position]
+            if start is not None and booking.end_ts <= start:
+                continue
+            if exclude_blocked and booking.blocked:
+                continue
+            if booking.nights < min_nights:
+                continue
+            if len(page) == limit:
+                return page, last_key
+            page.append(booking)
+            last_key = self._keys[position]
+        return page, None
@@ -1,22 +1,18 @@
 """Calendar platform for Landfolk Rentals."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import (
-    DOMAIN,
-    CONF_CHECKIN_TIME,
-    CONF_CHECKOUT_TIME,
-    DEFAULT_CHECKIN_TIME,
-    DEFAULT_CHECKOUT_TIME,
-)
+from .bookings import Booking
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,12 +28,12 @@ async def async_setup_entry(
     async_add_entities([LandfolkCalendar(coordinator, config_entry)], True)
 
 
-class LandfolkCalendar(CalendarEntity):
+class LandfolkCalendar(CoordinatorEntity, CalendarEntity):
     """Representation of a Landfolk Rentals calendar."""
 
     def __init__(self, coordinator, config_entry: ConfigEntry) -> None:
         """Initialize the calendar."""
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._attr_name = "Landfolk Rentals"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}"
@@ -49,109 +45,60 @@ class LandfolkCalendar(CalendarEntity):
             "model": "Calendar Integration",
             "entry_type": "service",
         }
-        
-        # Get configurable check-in/out times
-        self._checkin_time = config_entry.data.get(
-            CONF_CHECKIN_TIME, DEFAULT_CHECKIN_TIME
-        )
-        self._checkout_time = config_entry.data.get(
-            CONF_CHECKOUT_TIME, DEFAULT_CHECKOUT_TIME
-        )
 
     @property
     def event(self) -> CalendarEvent | None:
         """Return the next upcoming event."""
         return self._event
 
+    @property
+    def should_poll(self) -> bool:
+        """Keep polling so the next event advances between feed refreshes."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the state from a refreshed booking index."""
+        self._async_update_from_bookings()
+        super()._handle_coordinator_update()
+
     async def async_update(self) -> None:
         """Update the calendar entity."""
-        await self.coordinator.async_request_refresh()
-        
-        calendar = self.coordinator.data
-        if not calendar:
+        self._async_update_from_bookings()
+
+    @callback
+    def _async_update_from_bookings(self) -> None:
+        """Compute the state from the coordinator's booking index."""
+        bookings = self.coordinator.data
+        if not bookings:
+            self._event = None
             return
         
-        now = dt_util.now()
-        events = []
-        
-        # Parse all events from the calendar
-        for component in calendar.walk():
-            if component.name == "VEVENT":
-                event = self._parse_event(component)
-                if event and event.start >= now:
-                    events.append(event)
-        
-        # Sort events by start time and get the next one
-        if events:
-            events.sort(key=lambda e: e.start)
-            self._event = events[0]
-        else:
-            self._event = None
+        # Bookings are indexed by start time, so the next one comes first
+        upcoming = bookings.starting_from(dt_util.now().timestamp())
+        self._event = self._to_calendar_event(upcoming[0]) if upcoming else None
 
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
         """Return calendar events within a datetime range."""
-        calendar = self.coordinator.data
-        if not calendar:
+        bookings = self.coordinator.data
+        if not bookings:
             return []
         
-        events = []
-        
-        for component in calendar.walk():
-            if component.name == "VEVENT":
-                event = self._parse_event(component)
-                if event and event.start < end_date and event.end > start_date:
-                    events.append(event)
-        
-        return sorted(events, key=lambda e: e.start)
-
-    def _parse_event(self, component) -> CalendarEvent | None:
-        """Parse an iCal event component into a CalendarEvent."""
-        try:
-            summary = str(component.get("summary", "Booking"))
-            uid = str(component.get("uid", ""))
-            
-            # Get start and end datetime
-            dtstart = component.get("dtstart").dt
-            dtend = component.get("dtend").dt
-            
-            # Parse the configured check-in/out times
-            checkin_hour, checkin_minute = map(int, self._checkin_time.split(":"))
-            checkout_hour, checkout_minute = map(int, self._checkout_time.split(":"))
-            
-            # Landfolk uses VALUE=DATE format, so dtstart/dtend are date objects, not datetime
-            if isinstance(dtstart, datetime):
-                # Already a datetime (shouldn't happen with Landfolk, but handle it)
-                start = dtstart
-            else:
-                # Date only - apply check-in time
-                # Create datetime at midnight, then set to check-in time
-                start = datetime.combine(dtstart, datetime.min.time())
-                start = start.replace(hour=checkin_hour, minute=checkin_minute)
-            
-            if isinstance(dtend, datetime):
-                # Already a datetime (shouldn't happen with Landfolk, but handle it)
-                end = dtend
-            else:
-                # Date only - apply check-out time
-                # Landfolk's DTEND represents the actual checkout date (not exclusive)
-                end = datetime.combine(dtend, datetime.min.time())
-                end = end.replace(hour=checkout_hour, minute=checkout_minute)
-            
-            # Make timezone-aware using Home Assistant's timezone
-            if start.tzinfo is None:
-                start = dt_util.as_local(start)
-            if end.tzinfo is None:
-                end = dt_util.as_local(end)
-            
-            return CalendarEvent(
-                start=start,
-                end=end,
-                summary=summary,
-                uid=uid,
-            )
-            
-        except Exception as err:
-            _LOGGER.error("Error parsing event: %s", err)
-            return None
+        page, _ = bookings.query(
+            start=start_date.timestamp(),
+            end=end_date.timestamp(),
+            limit=len(bookings),
+        )
+        return [self._to_calendar_event(booking) for booking in page]
+
+    @staticmethod
+    def _to_calendar_event(booking: Booking) -> CalendarEvent:
+        """Convert a booking into a CalendarEvent."""
+        return CalendarEvent(
+            start=booking.start,
+            end=booking.end,
+            summary=booking.summary,
+            uid=booking.uid,
+        )
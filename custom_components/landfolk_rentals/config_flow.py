@@ -5,8 +5,6 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-import aiohttp
-from icalendar import Calendar
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
@@ -15,40 +13,56 @@ from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
     DOMAIN,
+    CONF_ARCHIVE_RETENTION,
     CONF_CALENDAR_URL,
     CONF_CHECKIN_TIME,
     CONF_CHECKOUT_TIME,
     CONF_EXCLUDE_BLOCKED,
+    CONF_MAX_FEED_SIZE,
+    DEFAULT_ARCHIVE_RETENTION,
     DEFAULT_CHECKIN_TIME,
     DEFAULT_CHECKOUT_TIME,
     DEFAULT_EXCLUDE_BLOCKED,
+    DEFAULT_MAX_FEED_SIZE,
 )
+from .feed import FeedError, FeedTooLarge, InvalidFeed, async_download_feed, parse_feed
+from .localtime import parse_time
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def validate_times(data: dict[str, Any]) -> dict[str, str]:
+    """Return form errors for check-in/out times that are not valid HH:MM."""
+    errors: dict[str, str] = {}
+    for key in (CONF_CHECKIN_TIME, CONF_CHECKOUT_TIME):
+        if key not in data:
+            continue
+        try:
+            parse_time(data[key])
+        except ValueError:
+            errors[key] = "invalid_time"
+    return errors
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     
     calendar_url = data[CONF_CALENDAR_URL]
+    max_feed_bytes = data.get(CONF_MAX_FEED_SIZE, DEFAULT_MAX_FEED_SIZE) * 1024
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(calendar_url, timeout=10) as response:
-                if response.status != 200:
-                    raise CannotConnect(f"HTTP {response.status}")
-                
-                ical_data = await response.text()
-                
-                # Try to parse the iCal data
-                try:
-                    calendar = Calendar.from_ical(ical_data)
-                except Exception as err:
-                    raise InvalidCalendar from err
-                
-    except aiohttp.ClientError as err:
+        download = await async_download_feed(calendar_url, max_feed_bytes, timeout=10)
+    except FeedTooLarge:
+        raise
+    except FeedError as err:
         raise CannotConnect from err
     
+    # Try to parse the iCal data
+    try:
+        await hass.async_add_executor_job(parse_feed, download.text)
+    except InvalidFeed as err:
+        raise InvalidCalendar from err
+    
     return {"title": "Landfolk Rentals"}
 
 
@@ -69,7 +83,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors: dict[str, str] = {}
         
-        if user_input is not None:
+        if user_input is not None and not (errors := validate_times(user_input)):
             try:
                 info = await validate_input(self.hass, user_input)
                 
@@ -78,6 +92,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "cannot_connect"
             except InvalidCalendar:
                 errors["base"] = "invalid_calendar"
+            except FeedTooLarge:
+                errors["base"] = "feed_too_large"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -97,6 +113,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_EXCLUDE_BLOCKED,
                     default=DEFAULT_EXCLUDE_BLOCKED
                 ): bool,
+                vol.Optional(
+                    CONF_MAX_FEED_SIZE,
+                    default=DEFAULT_MAX_FEED_SIZE
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_ARCHIVE_RETENTION,
+                    default=DEFAULT_ARCHIVE_RETENTION
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             }
         )
 
@@ -122,7 +146,8 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
-        if user_input is not None:
+        errors: dict[str, str] = {}
+        if user_input is not None and not (errors := validate_times(user_input)):
             # Update the config entry with new data
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
@@ -151,11 +176,20 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_EXCLUDE_BLOCKED,
                     default=self.config_entry.data.get(CONF_EXCLUDE_BLOCKED, DEFAULT_EXCLUDE_BLOCKED)
                 ): bool,
+                vol.Optional(
+                    CONF_MAX_FEED_SIZE,
+                    default=self.config_entry.data.get(CONF_MAX_FEED_SIZE, DEFAULT_MAX_FEED_SIZE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_ARCHIVE_RETENTION,
+                    default=self.config_entry.data.get(CONF_ARCHIVE_RETENTION, DEFAULT_ARCHIVE_RETENTION)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             }
         )
 
         return self.async_show_form(
             step_id="init",
-            data_schema=data_schema
+            data_schema=data_schema,
+            errors=errors,
         )
 
@@ -5,10 +5,16 @@ CONF_CALENDAR_URL = "calendar_url"
 CONF_CHECKIN_TIME = "checkin_time"
 CONF_CHECKOUT_TIME = "checkout_time"
 CONF_EXCLUDE_BLOCKED = "exclude_blocked"
+CONF_MAX_FEED_SIZE = "max_feed_size"
+CONF_ARCHIVE_RETENTION = "archive_retention"
 
 DEFAULT_CHECKIN_TIME = "14:00"
 DEFAULT_CHECKOUT_TIME = "11:00"
 DEFAULT_EXCLUDE_BLOCKED = True
+# Maximum decoded feed size in kilobytes
+DEFAULT_MAX_FEED_SIZE = 2048
+# Years of booking history to keep, 0 keeps everything
+DEFAULT_ARCHIVE_RETENTION = 5
 
 # Update interval in minutes
 UPDATE_INTERVAL = 60
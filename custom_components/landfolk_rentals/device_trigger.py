@@ -0,0 +1,109 @@
+"""Device triggers for Landfolk Rentals."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.device_automation.exceptions import (
+    InvalidDeviceAutomationConfig,
+)
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .bookings import Booking
+from .const import DOMAIN
+from .triggers import TRIGGER_TYPES, async_get_scheduler
+
+# Minutes before the check-in/out; negative values fire after it
+CONF_OFFSET = "offset"
+
+OFFSET_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=-7 * 24 * 60, max=7 * 24 * 60))
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Optional(CONF_OFFSET, default=0): OFFSET_SCHEMA,
+    }
+)
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """List device triggers for a Landfolk Rentals device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_TYPES
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """List trigger capabilities."""
+    return {
+        "extra_fields": vol.Schema(
+            {vol.Optional(CONF_OFFSET, default=0): OFFSET_SCHEMA}
+        )
+    }
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger that fires at a check-in/out, offset by some minutes."""
+    device = dr.async_get(hass).async_get(config[CONF_DEVICE_ID])
+    entry_id = next(
+        (
+            identifier
+            for domain, identifier in (device.identifiers if device else ())
+            if domain == DOMAIN
+        ),
+        None,
+    )
+    if entry_id is None:
+        raise InvalidDeviceAutomationConfig(
+            f"Device {config[CONF_DEVICE_ID]} is not a Landfolk Rentals device"
+        )
+
+    trigger_type = config[CONF_TYPE]
+    offset = config[CONF_OFFSET]
+    job = HassJob(action)
+    trigger_data = trigger_info["trigger_data"]
+
+    @callback
+    def async_fire(booking: Booking) -> None:
+        """Run the automation for a booking."""
+        hass.async_run_hass_job(
+            job,
+            {
+                "trigger": {
+                    **trigger_data,
+                    CONF_PLATFORM: "device",
+                    CONF_DOMAIN: DOMAIN,
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: trigger_type,
+                    CONF_OFFSET: offset,
+                    "booking": booking.as_dict(),
+                    "description": f"{trigger_type.replace('_', '-')} of {booking.summary}",
+                }
+            },
+        )
+
+    return async_get_scheduler(hass, entry_id).async_subscribe(
+        trigger_type, timedelta(minutes=offset), async_fire
+    )
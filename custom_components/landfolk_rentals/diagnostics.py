@@ -0,0 +1,46 @@
+"""Diagnostics support for Landfolk Rentals."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    download = coordinator.last_download
+
+    total_ratio = None
+    if coordinator.total_download_bytes:
+        total_ratio = round(
+            coordinator.total_content_bytes / coordinator.total_download_bytes, 2
+        )
+
+    return {
+        "feed": {
+            "max_feed_bytes": coordinator.max_feed_bytes,
+            "last_download_bytes": download.download_bytes if download else None,
+            "last_content_bytes": download.content_bytes if download else None,
+            "last_content_encoding": download.content_encoding if download else None,
+            "last_compression_ratio": download.compression_ratio if download else None,
+            "total_download_bytes": coordinator.total_download_bytes,
+            "total_content_bytes": coordinator.total_content_bytes,
+            "total_compression_ratio": total_ratio,
+        },
+        "timing": {
+            "setup_seconds": coordinator.setup_duration,
+            "last_refresh_seconds": coordinator.last_refresh_duration,
+        },
+        "bookings": len(coordinator.bookings) if coordinator.bookings else 0,
+        "archive": {
+            "records": len(coordinator.archive),
+            "retention_years": coordinator.archive_retention,
+            "retired_nights": coordinator.archive.retired_nights,
+        },
+    }
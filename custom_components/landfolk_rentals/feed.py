@@ -0,0 +1,215 @@
+"""Download helpers for the Landfolk iCal feed."""
+from __future__ import annotations
+
+import codecs
+from dataclasses import dataclass
+from datetime import date
+import logging
+import zlib
+
+import aiohttp
+
+from homeassistant.exceptions import HomeAssistantError
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024
+
+# Only brotli >= 1.2 can cap the output of a single call, which the size
+# limit needs; without it brotli is not requested.
+BROTLI_BOUNDED = brotli is not None and hasattr(
+    brotli.Decompressor, "can_accept_more_data"
+)
+
+ACCEPT_ENCODING = "br, gzip, deflate" if BROTLI_BOUNDED else "gzip, deflate"
+
+_ZLIB_DECOMPRESS = type(zlib.decompressobj())
+
+
+class FeedError(HomeAssistantError):
+    """Error to indicate the feed could not be downloaded."""
+
+
+class FeedTooLarge(FeedError):
+    """Error to indicate the feed exceeds the configured size limit."""
+
+
+class InvalidFeed(HomeAssistantError):
+    """Error to indicate the feed is not valid iCal data."""
+
+
+# (uid, summary, DTSTART, DTEND); DTSTART/DTEND are dates or datetimes
+RawEvent = tuple[str, str, date, date]
+
+
+@dataclass
+class FeedDownload:
+    """Result of downloading the iCal feed."""
+
+    text: str
+    download_bytes: int
+    content_bytes: int
+    content_encoding: str
+
+    @property
+    def compression_ratio(self) -> float:
+        """Return the ratio of decoded size to transferred size."""
+        if not self.download_bytes:
+            return 1.0
+        return round(self.content_bytes / self.download_bytes, 2)
+
+
+def _get_decompressor(encoding: str):
+    """Return an incremental decompressor for a Content-Encoding value."""
+    if encoding in ("", "identity"):
+        return None
+    if encoding in ("gzip", "x-gzip"):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    if encoding == "br" and BROTLI_BOUNDED:
+        return brotli.Decompressor()
+    raise aiohttp.ClientPayloadError(f"Unsupported content encoding: {encoding}")
+
+
+def _decompress(decompressor, chunk: bytes, limit: int) -> bytes:
+    """Decompress a chunk, stopping once more than ``limit`` bytes are produced.
+
+    zlib stops at exactly ``limit + 1`` bytes; brotli rounds its output
+    limit up to an internal buffer size (tens of KB). Input beyond that is
+    never expanded; the caller only needs to see that the limit was exceeded.
+    """
+    if isinstance(decompressor, _ZLIB_DECOMPRESS):
+        return decompressor.decompress(chunk, limit + 1)
+
+    output = decompressor.process(chunk, output_buffer_limit=limit + 1)
+    # Brotli keeps buffered input when it stops at the limit; drain it
+    while len(output) <= limit and not decompressor.can_accept_more_data():
+        output += decompressor.process(
+            b"", output_buffer_limit=limit + 1 - len(output)
+        )
+    return output
+
+
+async def async_fetch_feed(
+    session: aiohttp.ClientSession, url: str, max_bytes: int, timeout: int
+) -> FeedDownload:
+    """Stream the feed, decompressing and decoding it incrementally.
+
+    The session must be created with ``auto_decompress=False`` so the
+    transferred size can be measured. ``max_bytes`` limits the decompressed
+    body, and every decompression step is capped at the remaining budget, so
+    a compression bomb cannot expand past it in memory.
+    """
+    async with session.get(
+        url,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers={"Accept-Encoding": ACCEPT_ENCODING},
+    ) as response:
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"HTTP {response.status}",
+            )
+
+        if response.content_length and response.content_length > max_bytes:
+            raise FeedTooLarge(
+                f"Calendar feed is {response.content_length} bytes, "
+                f"exceeding the {max_bytes} byte limit"
+            )
+
+        encoding = response.headers.get(aiohttp.hdrs.CONTENT_ENCODING, "").lower()
+        decompressor = _get_decompressor(encoding)
+        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+            errors="replace"
+        )
+
+        download_bytes = 0
+        content_bytes = 0
+        parts: list[str] = []
+
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            download_bytes += len(chunk)
+            if decompressor is not None:
+                chunk = _decompress(decompressor, chunk, max_bytes - content_bytes)
+            content_bytes += len(chunk)
+            if content_bytes > max_bytes:
+                raise FeedTooLarge(
+                    f"Calendar feed exceeds the {max_bytes} byte limit"
+                )
+            parts.append(decoder.decode(chunk))
+
+        if isinstance(decompressor, _ZLIB_DECOMPRESS):
+            tail = decompressor.flush()
+            content_bytes += len(tail)
+            if content_bytes > max_bytes:
+                raise FeedTooLarge(
+                    f"Calendar feed exceeds the {max_bytes} byte limit"
+                )
+            parts.append(decoder.decode(tail))
+        parts.append(decoder.decode(b"", final=True))
+
+    result = FeedDownload(
+        text="".join(parts),
+        download_bytes=download_bytes,
+        content_bytes=content_bytes,
+        content_encoding=encoding or "identity",
+    )
+    _LOGGER.debug(
+        "Fetched calendar feed: %s bytes transferred, %s bytes decoded (%s, ratio %s)",
+        result.download_bytes,
+        result.content_bytes,
+        result.content_encoding,
+        result.compression_ratio,
+    )
+    return result
+
+
+async def async_download_feed(url: str, max_bytes: int, timeout: int) -> FeedDownload:
+    """Download the feed, raising FeedError on any transport problem."""
+    try:
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            return await async_fetch_feed(session, url, max_bytes, timeout)
+    except aiohttp.ClientResponseError as err:
+        raise FeedError(f"Error fetching calendar: {err.status}") from err
+    except (aiohttp.ClientError, TimeoutError) as err:
+        raise FeedError(f"Error communicating with API: {err}") from err
+
+
+def parse_feed(text: str) -> list[RawEvent]:
+    """Parse iCal text into raw events.
+
+    Runs in the executor; icalendar is only imported here so loading the
+    integration does not pull in the parsing stack.
+    """
+    from icalendar import Calendar  # pylint: disable=import-outside-toplevel
+
+    try:
+        calendar = Calendar.from_ical(text)
+    except Exception as err:
+        raise InvalidFeed(f"Invalid calendar data: {err}") from err
+
+    events: list[RawEvent] = []
+    for component in calendar.walk("VEVENT"):
+        try:
+            events.append(
+                (
+                    str(component.get("uid", "")),
+                    str(component.get("summary", "Booking")),
+                    component.get("dtstart").dt,
+                    component.get("dtend").dt,
+                )
+            )
+        except Exception as err:
+            _LOGGER.error("Error parsing event: %s", err)
+    return events
@@ -0,0 +1,64 @@
+"""Local time normalization for Landfolk bookings."""
+from __future__ import annotations
+
+from datetime import date, datetime, time, tzinfo
+import re
+
+from homeassistant.util import dt as dt_util
+
+TIME_PATTERN = re.compile(r"([01]?\d|2[0-3]):([0-5]\d)")
+
+
+def parse_time(value: str) -> time:
+    """Parse a configured HH:MM time, raising ValueError if it is malformed."""
+    if not (match := TIME_PATTERN.fullmatch(value.strip())):
+        raise ValueError(f"Invalid time {value!r}, expected HH:MM")
+    return time(int(match.group(1)), int(match.group(2)))
+
+
+class LocalTimeNormalizer:
+    """Convert booking dates to aware local datetimes, memoized per timezone.
+
+    Landfolk bookings are VALUE=DATE, so a feed only contains a few hundred
+    distinct dates. Each (date, time) pair is converted once and reused until
+    Home Assistant's timezone changes. The check-in/out times are fixed for
+    the lifetime of a config entry, which is reloaded when they change.
+    """
+
+    def __init__(self, checkin_time: str, checkout_time: str) -> None:
+        """Initialize the normalizer."""
+        self.checkin_time = parse_time(checkin_time)
+        self.checkout_time = parse_time(checkout_time)
+        self._time_zone: tzinfo | None = None
+        self._memo: dict[tuple[date, time], tuple[datetime, float]] = {}
+
+    def _lookup(self, day: date, at: time) -> tuple[datetime, float]:
+        """Return the memoized aware datetime and epoch for a local date/time."""
+        time_zone = dt_util.DEFAULT_TIME_ZONE
+        if time_zone is not self._time_zone:
+            self._time_zone = time_zone
+            self._memo = {}
+
+        key = (day, at)
+        if (hit := self._memo.get(key)) is None:
+            local = datetime.combine(day, at, tzinfo=time_zone)
+            # Round-trip through UTC so times inside a DST gap resolve to a
+            # real wall-clock time; ambiguous times keep the first occurrence.
+            local = local.astimezone(dt_util.UTC).astimezone(time_zone)
+            hit = self._memo[key] = (local, local.timestamp())
+        return hit
+
+    def _resolve(self, value: date | datetime, at: time) -> tuple[datetime, float]:
+        """Return the aware datetime and epoch for a DTSTART/DTEND value."""
+        if isinstance(value, datetime):
+            value = dt_util.as_local(value) if value.tzinfo is None else value
+            return value, value.timestamp()
+        return self._lookup(value, at)
+
+    def check_in(self, value: date | datetime) -> tuple[datetime, float]:
+        """Return the check-in datetime and epoch for a DTSTART value."""
+        return self._resolve(value, self.checkin_time)
+
+    def check_out(self, value: date | datetime) -> tuple[datetime, float]:
+        """Return the check-out datetime and epoch for a DTEND value."""
+        return self._resolve(value, self.checkout_time)
@@ -1,19 +1,27 @@
 """Sensor platform for Landfolk Rentals."""
 from __future__ import annotations
 
-from datetime import datetime
 import logging
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .bookings import Booking
+from .const import (
+    DOMAIN,
+    CONF_EXCLUDE_BLOCKED,
+    DEFAULT_EXCLUDE_BLOCKED,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Short preview for dashboards; use the get_bookings service for full lists
+EVENTS_ATTRIBUTE_LIMIT = 10
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,12 +34,15 @@ async def async_setup_entry(
     async_add_entities([LandfolkUpcomingRentalsSensor(coordinator, config_entry)], True)
 
 
-class LandfolkUpcomingRentalsSensor(SensorEntity):
+class LandfolkUpcomingRentalsSensor(CoordinatorEntity, SensorEntity):
     """Sensor that shows count and details of upcoming rentals."""
 
+    # Keep the booking preview out of the recorder's history
+    _unrecorded_attributes = frozenset({"events", "next_rental", "last_updated"})
+
     def __init__(self, coordinator, config_entry: ConfigEntry) -> None:
         """Initialize the sensor."""
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self._config_entry = config_entry
         self._attr_name = "Landfolk Upcoming Rentals"
         self._attr_unique_id = f"{DOMAIN}_{config_entry.entry_id}_upcoming"
@@ -44,24 +55,12 @@ class LandfolkUpcomingRentalsSensor(SensorEntity):
             "entry_type": "service",
         }
         
-        # Get configurable check-in/out times
-        from .const import (
-            CONF_CHECKIN_TIME,
-            CONF_CHECKOUT_TIME,
-            CONF_EXCLUDE_BLOCKED,
-            DEFAULT_CHECKIN_TIME,
-            DEFAULT_CHECKOUT_TIME,
-            DEFAULT_EXCLUDE_BLOCKED,
-        )
-        self._checkin_time = config_entry.data.get(
-            CONF_CHECKIN_TIME, DEFAULT_CHECKIN_TIME
-        )
-        self._checkout_time = config_entry.data.get(
-            CONF_CHECKOUT_TIME, DEFAULT_CHECKOUT_TIME
-        )
+        # Get configurable exclude blocked option
         self._exclude_blocked = config_entry.data.get(
             CONF_EXCLUDE_BLOCKED, DEFAULT_EXCLUDE_BLOCKED
         )
+        
+        self._upcoming: list[Booking] = []
 
     @property
     def icon(self) -> str:
@@ -77,43 +76,29 @@ class LandfolkUpcomingRentalsSensor(SensorEntity):
     @property
     def native_value(self) -> int:
         """Return the number of upcoming rentals."""
-        events = self._get_upcoming_events()
-        return len(events)
+        return len(self._upcoming)
 
     @property
     def extra_state_attributes(self) -> dict:
         """Return additional attributes."""
-        events = self._get_upcoming_events()
-        
         # Format events for easy consumption in templates
         formatted_events = []
         now = dt_util.now()
         
-        for event in events[:50]:  # Limit to 50 events to avoid attribute size issues
-            # Calculate nights (date difference, not time difference)
-            checkin_date = event["start"].date()
-            checkout_date = event["end"].date()
-            nights = (checkout_date - checkin_date).days
-            
-            # Extract booking ID from summary (e.g., "Booking #b75001f9")
-            import re
-            booking_id = None
-            if match := re.search(r'#([a-zA-Z0-9]+)', event["summary"]):
-                booking_id = match.group(1)
-            
+        for booking in self._upcoming[:EVENTS_ATTRIBUTE_LIMIT]:
             # Calculate time until check-in
-            seconds_until_checkin = (event["start"] - now).total_seconds()
+            seconds_until_checkin = (booking.start - now).total_seconds()
             days_until_checkin = int(seconds_until_checkin / 86400)
             hours_until_checkin = int((seconds_until_checkin % 86400) / 3600)
             
             formatted_events.append({
-                "summary": event["summary"],
-                "booking_id": booking_id,
-                "start": event["start"].isoformat(),
-                "end": event["end"].isoformat(),
-                "nights": nights,
-                "duration_days": (event["end"] - event["start"]).days,
-                "duration_hours": (event["end"] - event["start"]).seconds // 3600,
+                "summary": booking.summary,
+                "booking_id": booking.booking_id,
+                "start": booking.start.isoformat(),
+                "end": booking.end.isoformat(),
+                "nights": booking.nights,
+                "duration_days": (booking.end - booking.start).days,
+                "duration_hours": (booking.end - booking.start).seconds // 3600,
                 "days_until_checkin": days_until_checkin,
                 "hours_until_checkin": hours_until_checkin,
                 "seconds_until_checkin": int(seconds_until_checkin),
@@ -124,81 +109,32 @@ class LandfolkUpcomingRentalsSensor(SensorEntity):
         return {
             "events": formatted_events,
             "next_rental": next_event,
-            "last_updated": dt_util.now().isoformat(),
+            "last_updated": now.isoformat(),
         }
 
+    @property
+    def should_poll(self) -> bool:
+        """Keep polling so past check-ins drop out between feed refreshes."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the state from a refreshed booking index."""
+        self._async_update_from_bookings()
+        super()._handle_coordinator_update()
+
     async def async_update(self) -> None:
         """Update the sensor."""
-        await self.coordinator.async_request_refresh()
+        self._async_update_from_bookings()
 
-    def _get_upcoming_events(self) -> list[dict]:
-        """Get all upcoming events from the calendar."""
-        calendar = self.coordinator.data
-        if not calendar:
-            return []
+    @callback
+    def _async_update_from_bookings(self) -> None:
+        """Compute the state from the coordinator's booking index."""
+        bookings = self.coordinator.data
+        if not bookings:
+            self._upcoming = []
+            return
         
-        now = dt_util.now()
-        events = []
-        
-        # Parse all events from the calendar
-        for component in calendar.walk():
-            if component.name == "VEVENT":
-                event = self._parse_event(component)
-                if event and event["start"] >= now:
-                    # Filter blocked events if configured
-                    if self._exclude_blocked and "blocked" in event["summary"].lower():
-                        continue
-                    events.append(event)
-        
-        # Sort events by start time
-        events.sort(key=lambda e: e["start"])
-        return events
-
-    def _parse_event(self, component) -> dict | None:
-        """Parse an iCal event component into a dict."""
-        try:
-            from datetime import datetime, timedelta
-            
-            summary = str(component.get("summary", "Booking"))
-            uid = str(component.get("uid", ""))
-            
-            # Get start and end datetime
-            dtstart = component.get("dtstart").dt
-            dtend = component.get("dtend").dt
-            
-            # Parse the configured check-in/out times
-            checkin_hour, checkin_minute = map(int, self._checkin_time.split(":"))
-            checkout_hour, checkout_minute = map(int, self._checkout_time.split(":"))
-            
-            # Landfolk uses VALUE=DATE format, so dtstart/dtend are date objects, not datetime
-            if isinstance(dtstart, datetime):
-                start = dtstart
-            else:
-                # Date only - apply check-in time
-                start = datetime.combine(dtstart, datetime.min.time())
-                start = start.replace(hour=checkin_hour, minute=checkin_minute)
-            
-            if isinstance(dtend, datetime):
-                end = dtend
-            else:
-                # Date only - apply check-out time
-                # Landfolk's DTEND represents the actual checkout date (not exclusive)
-                end = datetime.combine(dtend, datetime.min.time())
-                end = end.replace(hour=checkout_hour, minute=checkout_minute)
-            
-            # Make timezone-aware using Home Assistant's timezone
-            if start.tzinfo is None:
-                start = dt_util.as_local(start)
-            if end.tzinfo is None:
-                end = dt_util.as_local(end)
-            
-            return {
-                "summary": summary,
-                "uid": uid,
-                "start": start,
-                "end": end,
-            }
-            
-        except Exception as err:
-            _LOGGER.error("Error parsing event: %s", err)
-            return None
+        self._upcoming = bookings.starting_from(
+            dt_util.now().timestamp(), self._exclude_blocked
+        )
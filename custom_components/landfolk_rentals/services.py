@@ -0,0 +1,138 @@
+"""Services for Landfolk Rentals."""
+from __future__ import annotations
+
+import base64
+import json
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .bookings import BOOKING_FIELDS, CursorKey
+from .const import DOMAIN
+
+SERVICE_GET_BOOKINGS = "get_bookings"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_EXCLUDE_BLOCKED = "exclude_blocked"
+ATTR_MIN_NIGHTS = "min_nights"
+ATTR_ORDER = "order"
+ATTR_LIMIT = "limit"
+ATTR_CURSOR = "cursor"
+ATTR_FIELDS = "fields"
+
+ORDER_ASC = "asc"
+ORDER_DESC = "desc"
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+GET_BOOKINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_EXCLUDE_BLOCKED): cv.boolean,
+        vol.Optional(ATTR_MIN_NIGHTS, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_ORDER, default=ORDER_ASC): vol.In([ORDER_ASC, ORDER_DESC]),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_LIMIT)
+        ),
+        vol.Optional(ATTR_CURSOR): cv.string,
+        vol.Optional(ATTR_FIELDS, default=list(BOOKING_FIELDS)): vol.All(
+            cv.ensure_list_csv, [vol.In(BOOKING_FIELDS)]
+        ),
+    }
+)
+
+
+def _encode_cursor(key: CursorKey, order: str) -> str:
+    """Encode a resume position as an opaque cursor."""
+    raw = json.dumps([*key, order], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str, order: str) -> CursorKey:
+    """Decode a cursor returned by a previous call."""
+    try:
+        start_ts, uid, end_ts, summary, duplicate, cursor_order = json.loads(
+            base64.urlsafe_b64decode(cursor)
+        )
+        key = (float(start_ts), str(uid), float(end_ts), str(summary), int(duplicate))
+    except (ValueError, TypeError) as err:
+        raise ServiceValidationError(f"Invalid cursor: {cursor}") from err
+    if cursor_order != order:
+        raise ServiceValidationError("Cursor was created with a different sort order")
+    return key
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str | None):
+    """Return the coordinator for a config entry, or the only one loaded."""
+    coordinators = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        if len(coordinators) != 1:
+            raise ServiceValidationError(
+                f"{ATTR_CONFIG_ENTRY_ID} is required when more than one calendar is configured"
+            )
+        return next(iter(coordinators.values()))
+    if (coordinator := coordinators.get(entry_id)) is None:
+        raise ServiceValidationError(f"Unknown config entry: {entry_id}")
+    return coordinator
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Landfolk Rentals services."""
+
+    @callback
+    def async_get_bookings(call: ServiceCall) -> ServiceResponse:
+        """Return a page of bookings from the in-memory index."""
+        coordinator = _get_coordinator(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        order = call.data[ATTR_ORDER]
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        after = None
+        if cursor := call.data.get(ATTR_CURSOR):
+            after = _decode_cursor(cursor, order)
+
+        if coordinator.bookings is None:
+            return {"bookings": [], "next_cursor": None}
+
+        bookings, next_key = coordinator.bookings.query(
+            # Naive datetimes are in Home Assistant's timezone
+            start=dt_util.as_local(start).timestamp() if start else None,
+            end=dt_util.as_local(end).timestamp() if end else None,
+            exclude_blocked=call.data.get(
+                ATTR_EXCLUDE_BLOCKED, coordinator.exclude_blocked
+            ),
+            min_nights=call.data[ATTR_MIN_NIGHTS],
+            descending=order == ORDER_DESC,
+            after=after,
+            limit=call.data[ATTR_LIMIT],
+        )
+        fields = call.data[ATTR_FIELDS]
+        return {
+            "bookings": [booking.as_dict(fields) for booking in bookings],
+            "next_cursor": _encode_cursor(next_key, order) if next_key else None,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_BOOKINGS,
+        async_get_bookings,
+        schema=GET_BOOKINGS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,217 @@
+"""Point-in-time scheduling of check-in/check-out triggers."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .bookings import EDGE_END, EDGE_START, Booking
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEDULERS = f"{DOMAIN}_schedulers"
+
+TRIGGER_CHECK_IN = "check_in"
+TRIGGER_CHECK_OUT = "check_out"
+TRIGGER_TYPES = {TRIGGER_CHECK_IN: EDGE_START, TRIGGER_CHECK_OUT: EDGE_END}
+
+EVENT_CHECK_IN = f"{DOMAIN}_check_in"
+EVENT_CHECK_OUT = f"{DOMAIN}_check_out"
+
+
+@dataclass
+class _Subscription:
+    """A callback armed for the next check-in/out minus an offset."""
+
+    trigger_type: str
+    offset: timedelta
+    action: Callable[[Booking], None]
+    booking: Booking | None = None
+    fire_at: datetime | None = None
+    unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_cancel_timer(self) -> None:
+        """Cancel the armed timer, if any."""
+        if self.unsub_timer is not None:
+            self.unsub_timer()
+        self.unsub_timer = None
+        self.booking = None
+        self.fire_at = None
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant, entry_id: str) -> BookingScheduler:
+    """Return the scheduler for a config entry, creating it if needed.
+
+    Schedulers outlive entry reloads so automations attached to the device
+    keep their subscriptions while the coordinator is replaced.
+    """
+    schedulers: dict[str, BookingScheduler] = hass.data.setdefault(DATA_SCHEDULERS, {})
+    if (scheduler := schedulers.get(entry_id)) is None:
+        scheduler = schedulers[entry_id] = BookingScheduler(hass, entry_id)
+    return scheduler
+
+
+class BookingScheduler:
+    """Arm one exact timer per subscription from the coordinator's booking index.
+
+    Nothing runs between bookings: each subscription sleeps until its next
+    check-in/out (minus the offset) and re-arms after firing or when the feed
+    is refreshed.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self._coordinator = None
+        self._subscriptions: list[_Subscription] = []
+        self._unsub_coordinator: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_attach_coordinator(self, coordinator) -> CALLBACK_TYPE:
+        """Follow a coordinator's booking index until the returned callback is called."""
+        self._coordinator = coordinator
+        self._unsub_coordinator = coordinator.async_add_listener(self._async_reschedule)
+        self._async_reschedule()
+        return self._async_detach_coordinator
+
+    @callback
+    def _async_detach_coordinator(self) -> None:
+        """Stop following the coordinator and cancel all timers."""
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+        self._unsub_coordinator = None
+        self._coordinator = None
+        for subscription in self._subscriptions:
+            subscription.async_cancel_timer()
+        self._async_release()
+
+    @callback
+    def _async_release(self) -> None:
+        """Forget this scheduler once nothing uses it."""
+        if self._coordinator is None and not self._subscriptions:
+            schedulers = self.hass.data.get(DATA_SCHEDULERS, {})
+            if schedulers.get(self.entry_id) is self:
+                del schedulers[self.entry_id]
+
+    @callback
+    def async_subscribe(
+        self,
+        trigger_type: str,
+        offset: timedelta,
+        action: Callable[[Booking], None],
+    ) -> CALLBACK_TYPE:
+        """Call action at each check-in/out minus offset; return an unsubscribe callback."""
+        subscription = _Subscription(trigger_type, offset, action)
+        self._subscriptions.append(subscription)
+        self._async_arm(subscription, dt_util.utcnow())
+
+        @callback
+        def async_unsubscribe() -> None:
+            subscription.async_cancel_timer()
+            self._subscriptions.remove(subscription)
+            self._async_release()
+
+        return async_unsubscribe
+
+    @callback
+    def _async_reschedule(self) -> None:
+        """Re-arm every subscription after the booking index changed."""
+        now = dt_util.utcnow()
+        for subscription in self._subscriptions:
+            self._async_arm(subscription, now)
+
+    @callback
+    def _async_arm(self, subscription: _Subscription, now: datetime) -> None:
+        """Arm a subscription for the next booking edge after now."""
+        if self._coordinator is None or self._coordinator.bookings is None:
+            subscription.async_cancel_timer()
+            return
+
+        edge_type = TRIGGER_TYPES[subscription.trigger_type]
+        booking = self._coordinator.bookings.next_edge(
+            edge_type,
+            (now + subscription.offset).timestamp(),
+            self._coordinator.exclude_blocked,
+        )
+        if booking is None:
+            subscription.async_cancel_timer()
+            return
+
+        if edge_type == EDGE_START:
+            edge, edge_ts = booking.start, booking.start_ts
+        else:
+            edge, edge_ts = booking.end, booking.end_ts
+        fire_at = edge - subscription.offset
+        if fire_at == subscription.fire_at and booking == subscription.booking:
+            return
+
+        subscription.async_cancel_timer()
+
+        @callback
+        def async_fire(_now: datetime) -> None:
+            subscription.unsub_timer = None
+            subscription.booking = None
+            subscription.fire_at = None
+            # Several bookings can share a check-in/out time (e.g. multiple
+            # units on one feed); fire for each before arming past the edge.
+            for edge_booking in self._coordinator.bookings.at_edge(
+                edge_type, edge_ts, self._coordinator.exclude_blocked
+            ):
+                subscription.action(edge_booking)
+            # Arm strictly after this edge so the same booking never fires twice
+            self._async_arm(subscription, max(dt_util.utcnow(), fire_at))
+
+        subscription.booking = booking
+        subscription.fire_at = fire_at
+        subscription.unsub_timer = async_track_point_in_utc_time(
+            self.hass, async_fire, fire_at
+        )
+
+    @callback
+    def async_setup_events(self) -> CALLBACK_TYPE:
+        """Fire check-in/check-out events on the bus; return an unsubscribe callback."""
+        unsubs = [
+            self.async_subscribe(
+                trigger_type,
+                timedelta(0),
+                lambda booking, event_type=event_type: self._async_fire_event(
+                    event_type, booking
+                ),
+            )
+            for trigger_type, event_type in (
+                (TRIGGER_CHECK_IN, EVENT_CHECK_IN),
+                (TRIGGER_CHECK_OUT, EVENT_CHECK_OUT),
+            )
+        ]
+
+        @callback
+        def async_unsubscribe() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return async_unsubscribe
+
+    @callback
+    def _async_fire_event(self, event_type: str, booking: Booking) -> None:
+        """Fire a bus event for a check-in/out."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.entry_id)}
+        )
+        self.hass.bus.async_fire(
+            event_type,
+            {
+                "entry_id": self.entry_id,
+                "device_id": device.id if device else None,
+                **booking.as_dict(),
+            },
+        )